@@ -1,17 +1,83 @@
 # FastAPI entrypoint
+import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.routers import transcribe, summarise, match, topic_extraction_comparison, transcribe_summarise, health_check
+from app.services.topic_extraction import get_keybert_model
+from app.services.transcription import MAX_UPLOAD_BYTES, get_batched_pipeline
 
-app = FastAPI(title="ML Takehome API", version="1.0.0")
+def preload_topic_models() -> None:
+    """
+    Load the default KeyBERT model (and the SentenceTransformer it wraps) into its cache
+    The model name is passed positionally, as on the request path, since lru_cache keys on it
+    """
+    get_keybert_model("all-MiniLM-L6-v2")
 
-# Include routers
-app.include_router(transcribe.router, prefix="/transcribe", tags=["transcribe"])
+def preload_models() -> None:
+    """
+    Load the default KeyBERT and Whisper models into their caches
+    """
+    preload_topic_models()
+    get_batched_pipeline()
+
+# With PRELOAD_MODELS=1 the topic models load at import, so under `gunicorn --preload`
+# the master loads them once and forked workers share the weights copy-on-write.
+# Whisper is left to each worker's lifespan: CTranslate2 starts its thread pool when
+# the model is built, and threads do not survive a fork
+if os.getenv("PRELOAD_MODELS") == "1":
+    preload_topic_models()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the models before serving so the first request pays no cold start
+    # (KeyBERT is a cache hit when it was preloaded before the workers forked)
+    await asyncio.to_thread(preload_models)
+    yield
+
+class ContentLengthLimitMiddleware:
+    """
+    Reject requests whose declared Content-Length exceeds max_bytes with a 413 before
+    any of the body is read; uploads without a declared length are checked after
+    parsing by check_upload_size
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > self.max_bytes:
+                response = JSONResponse(
+                    {"detail": f"Request body too large (max {self.max_bytes // (1024 * 1024)} MB)"},
+                    status_code=413
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+# Routes are matched exactly (no trailing-slash 307 redirects)
+app = FastAPI(title="ML Takehome API", version="1.0.0", redirect_slashes=False, lifespan=lifespan)
+
+# Compress larger JSON responses (topic comparison, health check results)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# Added last so it runs first: oversized uploads are refused before Starlette spools them to disk
+app.add_middleware(ContentLengthLimitMiddleware, max_bytes=MAX_UPLOAD_BYTES)
+
+# Include routers - Starlette matches routes in registration order, so the
+# highest-traffic endpoints come first and the health check last
+app.include_router(match.router, prefix="/match", tags=["match"])
 app.include_router(summarise.router, prefix="/summarise", tags=["summarise"])
+app.include_router(transcribe.router, prefix="/transcribe", tags=["transcribe"])
 app.include_router(transcribe_summarise.router, prefix="/transcribe-summarise", tags=["transcribe-summarise"])
-app.include_router(match.router, prefix="/match", tags=["match"])
 app.include_router(topic_extraction_comparison.router, prefix="/topic-extraction-comparison", tags=["topic-extraction-comparison"])
 app.include_router(health_check.router, prefix="/health", tags=["health"])
 
 @app.get("/")
-async def root():
+async def root() -> dict[str, str]:
     return {"message": "ML Takehome API is running"}
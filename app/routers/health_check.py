@@ -1,16 +1,30 @@
 # Health check router - run tests and return results
-import subprocess
-import json
-import re
+import os
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 router = APIRouter()
 
+TESTS_DIR = Path("tests")
+# Fast tests that exercise the core services without loading the heavy models;
+# override with a comma-separated list of node IDs in HEALTHCHECK_SMOKE_NODES
+DEFAULT_SMOKE_NODES = ("tests/test_user_matching.py", "tests/test_vectorization.py")
+
+# pytest.main is not re-entrant and a timed-out run keeps going in its thread,
+# so runs go through one dedicated worker and overlapping requests are rejected
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="healthcheck")
+_RUN_LOCK = threading.Lock()
+
 class TestResult(BaseModel):
     test_name: str
-    status: str  # "PASSED", "FAILED", "ERROR"
+    status: str  # "PASSED", "FAILED", "SKIPPED", "ERROR"
     duration: Optional[float] = None
     error_message: Optional[str] = None
 
@@ -23,109 +37,140 @@ class HealthCheckResponse(BaseModel):
     test_results: List[TestResult]
     summary: str
 
-def parse_pytest_output(output: str) -> tuple[List[TestResult], dict]:
-    """Parse pytest output to extract test results"""
-    test_results = []
-    summary = {}
-    
-    # Parse individual test results - improved regex to handle progress percentages
-    test_pattern = r'tests/([^:]+)::([^\s]+)\s+([A-Z]+)(?:\s+\[([^\]]+)\])?'
-    for line in output.split('\n'):
-        # Skip lines with progress percentages
-        if '%' in line and '[' in line and ']' in line:
-            continue
-            
-        match = re.search(test_pattern, line)
-        if match:
-            file_name, test_name, status, duration_str = match.groups()
-            try:
-                duration = float(duration_str) if duration_str else None
-            except ValueError:
-                duration = None
-            
-            test_results.append(TestResult(
-                test_name=f"{file_name}::{test_name}",
-                status=status,
-                duration=duration
-            ))
-    
-    # Parse summary - improved regex to handle various formats
-    summary_patterns = [
-        r'(\d+)\s+passed(?:,\s+(\d+)\s+failed)?(?:,\s+(\d+)\s+warnings)?\s+in\s+([\d.]+)s',
-        r'(\d+)\s+passed(?:,\s+(\d+)\s+failed)?(?:,\s+(\d+)\s+warnings)?',
-        r'(\d+)\s+passed'
+class ResultCollector:
+    """pytest plugin that records one TestResult per test (or module that fails to collect)"""
+
+    def __init__(self):
+        self._results: Dict[str, TestResult] = {}
+
+    @property
+    def results(self) -> List[TestResult]:
+        return list(self._results.values())
+
+    def pytest_collectreport(self, report):
+        # A module that fails to import never produces test reports of its own
+        if report.failed:
+            self._record(report, "ERROR")
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            status = report.outcome.upper()
+        elif report.failed:
+            # Failure in setup/teardown (fixtures, imports) rather than the test body
+            status = "ERROR"
+        elif report.skipped:
+            status = "SKIPPED"
+        else:
+            return
+
+        self._record(report, status)
+
+    def _record(self, report, status: str):
+        # One entry per node ID: a later report (e.g. a teardown error after a
+        # passed call) replaces the earlier outcome, but never hides a failure
+        previous = self._results.get(report.nodeid)
+        if previous is not None and previous.status in ("FAILED", "ERROR"):
+            return
+
+        self._results[report.nodeid] = TestResult(
+            test_name=report.nodeid,
+            status=status,
+            duration=getattr(report, "duration", None),
+            error_message=(report.longreprtext or None) if report.failed else None
+        )
+
+def smoke_node_ids() -> List[str]:
+    """
+    Node IDs for the smoke level, from HEALTHCHECK_SMOKE_NODES or the defaults
+    """
+    configured = os.getenv("HEALTHCHECK_SMOKE_NODES")
+    if configured:
+        return [node.strip() for node in configured.split(",") if node.strip()]
+    return list(DEFAULT_SMOKE_NODES)
+
+def run_tests(level: str, collector: ResultCollector) -> int:
+    """
+    Run the smoke subset or the full suite in-process, reporting into collector
+    """
+    # The full level runs the whole directory, so a module that fails to import
+    # is reported as a collection error instead of silently dropped
+    node_ids = smoke_node_ids() if level == "smoke" else []
+    args = [
+        "-W", "ignore::DeprecationWarning",
+        "--tb=short",
+        "-q",
+        # This runs inside the server: capture at the sys level only, since fd-level
+        # capture redirects the process's stdout/stderr and swallows the server's logs
+        # for the whole run; ignore the ini addopts (verbose, coloured output) and
+        # write no .pytest_cache into the server's working directory
+        "--capture=sys",
+        "-o", "addopts=",
+        "-p", "no:cacheprovider",
+        # Run the modules that import fine even when another fails to collect,
+        # so one broken module does not hide the state of every other test
+        "--continue-on-collection-errors",
+        *(node_ids or [str(TESTS_DIR)])
     ]
-    
-    for pattern in summary_patterns:
-        summary_match = re.search(pattern, output)
-        if summary_match:
-            passed = int(summary_match.group(1))
-            failed = int(summary_match.group(2) or 0) if summary_match.groups()[1] else 0
-            warnings = int(summary_match.group(3) or 0) if len(summary_match.groups()) > 2 and summary_match.groups()[2] else 0
-            execution_time = float(summary_match.group(4)) if len(summary_match.groups()) > 3 and summary_match.groups()[3] else 0.0
-            
-            summary = {
-                "total_tests": passed + failed,
-                "passed_tests": passed,
-                "failed_tests": failed,
-                "warnings": warnings,
-                "execution_time": execution_time
-            }
-            break
-    
-    return test_results, summary
-
-@router.get("/", response_model=HealthCheckResponse)
-async def health_check():
+    return pytest.main(args, plugins=[collector])
+
+@router.get("", response_model=HealthCheckResponse)
+async def health_check(level: Literal["smoke", "full"] = "smoke"):
     """
-    Run the full test suite and return health status
+    Run the test suite and return health status
+    level=smoke (default) runs a fast subset; level=full runs every test
     """
+    if not _RUN_LOCK.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="A health check is already running"
+        )
+
     try:
-        # Run pytest with deprecation warnings ignored
-        cmd = [
-            "python", "-m", "pytest", 
-            "-W", "ignore::DeprecationWarning",
-            "--tb=short",
-            "-v"
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
+        # Run pytest in-process (off the event loop) with deprecation warnings ignored
+        collector = ResultCollector()
+
+        start_time = time.perf_counter()
+        future = _EXECUTOR.submit(run_tests, level, collector)
+        # Release only once the run really ends, which may be after a timeout
+        future.add_done_callback(lambda _: _RUN_LOCK.release())
+        exit_code = await asyncio.wait_for(
+            asyncio.wrap_future(future),
             timeout=120  # 2 minute timeout
         )
-        
-        # Parse the output
-        test_results, summary = parse_pytest_output(result.stdout)
-        
+        execution_time = time.perf_counter() - start_time
+
+        test_results = collector.results
+        passed_tests = sum(1 for r in test_results if r.status == "PASSED")
+        failed_tests = sum(1 for r in test_results if r.status in ("FAILED", "ERROR"))
+        total_tests = passed_tests + failed_tests
+
         # Determine overall health status
-        if result.returncode == 0 and summary.get("failed_tests", 0) == 0:
+        if exit_code == pytest.ExitCode.OK and failed_tests == 0:
             status = "healthy"
         else:
             status = "unhealthy"
-        
+
         # Create response
         response = HealthCheckResponse(
             status=status,
-            total_tests=summary.get("total_tests", 0),
-            passed_tests=summary.get("passed_tests", 0),
-            failed_tests=summary.get("failed_tests", 0),
-            execution_time=summary.get("execution_time", 0.0),
+            total_tests=total_tests,
+            passed_tests=passed_tests,
+            failed_tests=failed_tests,
+            execution_time=execution_time,
             test_results=test_results,
-            summary=f"Tests: {summary.get('passed_tests', 0)}/{summary.get('total_tests', 0)} passed, "
-                   f"Execution time: {summary.get('execution_time', 0.0):.2f}s"
+            summary=f"Tests: {passed_tests}/{total_tests} passed, "
+                   f"Execution time: {execution_time:.2f}s"
         )
-        
+
         return response
-        
-    except subprocess.TimeoutExpired:
+
+    except asyncio.TimeoutError:
         raise HTTPException(
-            status_code=408, 
+            status_code=408,
             detail="Test execution timed out after 2 minutes"
         )
     except Exception as e:
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
             detail=f"Failed to run health check: {str(e)}"
         )
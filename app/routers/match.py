@@ -1,12 +1,14 @@
 # POST /match
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 from app.services.user_matching import compute_compatibility
-from app.utils.io_utils import load_users
+from app.utils.io_utils import load_users_cached
 
 router = APIRouter()
 
+USERS_FILE = "sample_data/synthetic_users.json"
+
 class MatchRequest(BaseModel):
     user1_id: str = "user_1"
     user2_id: str = "user_2"
@@ -18,28 +20,29 @@ class MatchResponse(BaseModel):
     score: float
     interpretation: str
 
-@router.post("/", response_model=MatchResponse)
+@router.post("", response_model=MatchResponse)
 async def match(request: MatchRequest):
     """
     Compute compatibility score between two users
     Optionally include topics for enhanced matching with weighted combination
     """
     try:
-        users = load_users("sample_data/synthetic_users.json")
+        users = load_users_cached(USERS_FILE)
         
         # Edge case: Validate user IDs exist
-        if request.user1_id not in users:
-            raise ValueError(f"User {request.user1_id} not found")
-        if request.user2_id not in users:
-            raise ValueError(f"User {request.user2_id} not found")
+        try:
+            user1 = users[request.user1_id]
+            user2 = users[request.user2_id]
+        except KeyError as e:
+            raise ValueError(f"User {e.args[0]} not found")
         
         # Edge case: Validate weights are reasonable
         if request.topic_weight > 10 or request.psych_weight > 10:
             raise ValueError("Weights too high (max 10)")
         
         score, interpretation = compute_compatibility(
-            users[request.user1_id], 
-            users[request.user2_id],
+            user1, 
+            user2,
             topics=request.topics,
             topic_weight=request.topic_weight,
             psych_weight=request.psych_weight
@@ -49,10 +52,8 @@ async def match(request: MatchRequest):
         
     except ValueError as e:
         # Re-raise validation errors with proper HTTP status
-        from fastapi import HTTPException
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Handle unexpected errors
-        from fastapi import HTTPException
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
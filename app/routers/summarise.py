@@ -1,4 +1,5 @@
 # POST /summarise
+import asyncio
 from fastapi import APIRouter
 from pydantic import BaseModel
 from app.services.topic_extraction import extract_topics, generate_summary
@@ -12,12 +13,12 @@ class SummariseResponse(BaseModel):
     topics: list[str]
     summary: str
 
-@router.post("/", response_model=SummariseResponse)
+@router.post("", response_model=SummariseResponse)
 async def summarise(request: SummariseRequest):
     """
     Extract topics and generate summary from transcript
     """
-    topics = extract_topics(request.transcript)
-    summary = generate_summary(request.transcript, topics)
+    topics = await asyncio.to_thread(extract_topics, request.transcript)
+    summary = await asyncio.to_thread(generate_summary, request.transcript, topics)
     return {"topics": topics, "summary": summary}
 
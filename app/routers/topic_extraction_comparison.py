@@ -1,15 +1,17 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import time
+import heapq
+import asyncio
+import functools
 import psutil
 import os
-from sklearn.feature_extraction.text import TfidfVectorizer
-from keybert import KeyBERT
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import KMeans
 import spacy
 from collections import Counter
+from app.services.topic_extraction import get_keybert_model, get_sentence_transformer, tokenize, is_trivial_transcript, cheap_topics
 
 router = APIRouter()
 
@@ -21,35 +23,49 @@ class MethodResult(BaseModel):
     method: str
     topics: List[str]
     time_sec: float
-    memory_mb: float
+    memory_mb: Optional[float] = None  # not reported when methods run concurrently
+    note: Optional[str] = None  # set when a fast path skipped the model
 
 class TopicComparisonResponse(BaseModel):
     results: List[MethodResult]
     summary: Dict[str, Any]
 
+# Reused between calls (constructing a Process re-reads /proc), but created lazily and
+# rebuilt after a fork so gunicorn --preload workers measure themselves, not the master
+_process: Optional[psutil.Process] = None
+
 def get_memory_usage_mb():
     """Return current memory usage (MB) of this process."""
-    process = psutil.Process(os.getpid())
-    return process.memory_info().rss / (1024 * 1024)
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process(os.getpid())
+    return _process.memory_info().rss / (1024 * 1024)
+
+@functools.lru_cache(maxsize=1)
+def get_spacy_nlp():
+    """Load the spaCy pipeline once, keeping only the components needed for POS tagging."""
+    try:
+        return spacy.load("en_core_web_sm", disable=["parser", "ner", "lemmatizer"])
+    except OSError:
+        raise HTTPException(status_code=500, detail="spaCy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
 
 def extract_topics_tfidf(text: str, top_n: int = 5) -> List[str]:
     """Extract topics using TF-IDF"""
-    vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1,2))
-    X = vectorizer.fit_transform([text])
-    scores = X.toarray()[0]
-    terms = vectorizer.get_feature_names_out()
-    term_score_pairs = list(zip(terms, scores))
-    term_score_pairs.sort(key=lambda x: x[1], reverse=True)
-    top_terms = [t for t, s in term_score_pairs[:top_n]]
-    return top_terms
+    # With a single document every term has the same IDF, so TF-IDF ranking reduces to
+    # term counts; count unigrams and bigrams directly instead of fitting a vectorizer
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    # Ties are broken alphabetically, matching the vectorizer's sorted vocabulary
+    top_terms = heapq.nsmallest(top_n, counts.items(), key=lambda x: (-x[1], x[0]))
+    return [t for t, _ in top_terms]
 
 def extract_topics_spacy(text: str, top_n: int = 5) -> List[str]:
     """Extract topics using spaCy"""
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        raise HTTPException(status_code=500, detail="spaCy model 'en_core_web_sm' not found. Please install it with: python -m spacy download en_core_web_sm")
+    if is_trivial_transcript(text):
+        return cheap_topics(text, top_n)
     
+    nlp = get_spacy_nlp()
     doc = nlp(text.lower())
     # Use nouns and proper nouns only
     candidates = [token.text for token in doc if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop]
@@ -60,138 +76,122 @@ def extract_topics_spacy(text: str, top_n: int = 5) -> List[str]:
 
 def extract_topics_keybert(text: str, top_n: int = 5, model_name: str = "all-MiniLM-L6-v2") -> List[str]:
     """Extract topics using KeyBERT"""
-    kw_model = KeyBERT(model_name)
+    if is_trivial_transcript(text):
+        return cheap_topics(text, top_n)
+    kw_model = get_keybert_model(model_name)
     # stop_words='english' removes common English stop words
     # use_mmr=True (Maximal Marginal Relevance) reduces repeated/similar keywords
     keywords = kw_model.extract_keywords(text, top_n=top_n, stop_words='english', use_mmr=True)
     return [kw for kw, score in keywords]
 
-def extract_topics_distilbert(text: str, top_n: int = 5, model_name: str = "distilbert-base-nli-stsb-mean-tokens") -> List[str]:
-    """Extract topics using DistilBERT + Clustering"""
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
-    model = SentenceTransformer(model_name)
-    embeddings = model.encode(sentences)
+@functools.lru_cache(maxsize=32)
+def _split_sentences(text: str) -> tuple[str, ...]:
+    """Split transcript into sentences (cached, as both clustering methods split the same text)"""
+    return tuple(s.strip() for s in text.split('.') if s.strip())
+
+def _cluster_topics(sentences: tuple[str, ...], model: SentenceTransformer, top_n: int) -> List[str]:
+    """Embed sentences, cluster them with KMeans and pick the longest sentence per cluster"""
+    # With no more sentences than clusters every sentence is its own cluster
+    if len(sentences) <= top_n:
+        return list(sentences)
+    
+    embeddings = model.encode(list(sentences), batch_size=64, convert_to_numpy=True, show_progress_bar=False)
     
     n_clusters = min(top_n, len(sentences))
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+    # Pin n_init: one k-means++ initialisation (the sklearn >= 1.4 default) is plenty for a handful of clusters
+    kmeans = KMeans(n_clusters=n_clusters, n_init=1, random_state=42)
     kmeans.fit(embeddings)
     
-    labels = kmeans.labels_
-    topics = []
-    for i in range(n_clusters):
-        cluster_sentences = [sentences[j] for j in range(len(sentences)) if labels[j]==i]
-        topics.append(max(cluster_sentences, key=len))  # pick longest sentence
-    return topics
+    # pick the longest sentence in each cluster as its representative topic, in one
+    # pass over the sentences (the first of equal-length sentences wins)
+    best = [("", -1)] * n_clusters
+    for sentence, label in zip(sentences, kmeans.labels_.tolist()):
+        if len(sentence) > best[label][1]:
+            best[label] = (sentence, len(sentence))
+    return [sentence for sentence, _ in best]
+
+def extract_topics_distilbert(text: str, top_n: int = 5, model_name: str = "distilbert-base-nli-stsb-mean-tokens") -> List[str]:
+    """Extract topics using DistilBERT + Clustering"""
+    return _cluster_topics(_split_sentences(text), get_sentence_transformer(model_name), top_n)
 
 def extract_topics_st_clustering(text: str, top_n: int = 5, model_name: str = "all-MiniLM-L6-v2") -> List[str]:
     """Extract topics using SentenceTransformer + Clustering"""
-    # Split transcript into sentences
-    sentences = [s.strip() for s in text.split('.') if s.strip()]
-    model = SentenceTransformer(model_name)
-    embeddings = model.encode(sentences)
-    
-    n_clusters = min(top_n, len(sentences))
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-    kmeans.fit(embeddings)
-    
-    cluster_centers = kmeans.cluster_centers_
-    labels = kmeans.labels_
-    
-    topics = []
-    for i in range(n_clusters):
-        cluster_sentences = [sentences[j] for j in range(len(sentences)) if labels[j]==i]
-        # pick the longest sentence as representative topic
-        topics.append(max(cluster_sentences, key=len))
-    return topics
-
-@router.post("/", response_model=TopicComparisonResponse)
-async def compare_topic_extraction_methods(request: TopicComparisonRequest):
+    return _cluster_topics(_split_sentences(text), get_sentence_transformer(model_name), top_n)
+
+METHODS = (
+    ("TF-IDF", extract_topics_tfidf),
+    ("spaCy", extract_topics_spacy),
+    ("KeyBERT", extract_topics_keybert),
+    ("DistilBERT+Clustering", extract_topics_distilbert),
+    ("ST+Clustering", extract_topics_st_clustering),
+)
+
+_CLUSTERING_METHODS = frozenset({"DistilBERT+Clustering", "ST+Clustering"})
+
+def _fast_path_note(name: str, transcript: str, top_n: int) -> Optional[str]:
+    """Describe the fast path a method takes for this transcript, if any"""
+    if name in _CLUSTERING_METHODS:
+        if len(_split_sentences(transcript)) <= top_n:
+            return "No more sentences than top_n; sentences returned without embedding or clustering"
+    elif name != "TF-IDF" and is_trivial_transcript(transcript):
+        return "Transcript too short for the model; topics are keyword counts"
+    return None
+
+def _run_method(name: str, fn, transcript: str, top_n: int, measure_memory: bool = True) -> MethodResult:
+    """Run a single extraction method and record its time and memory usage"""
+    start_mem = get_memory_usage_mb() if measure_memory else None
+    start_time = time.time()
+    topics = fn(transcript, top_n)
+    elapsed = time.time() - start_time
+    # Process-wide RSS deltas are only meaningful when methods run one at a time
+    memory_mb = round(get_memory_usage_mb() - start_mem, 1) if measure_memory else None
+
+    return MethodResult(
+        method=name,
+        topics=topics,
+        time_sec=round(elapsed, 3),
+        memory_mb=memory_mb,
+        note=_fast_path_note(name, transcript, top_n)
+    )
+
+@router.post("", response_model=TopicComparisonResponse)
+async def compare_topic_extraction_methods(request: TopicComparisonRequest, concurrent: bool = False):
     """
     Compare different topic extraction methods on the same transcript
+    Set concurrent=true to run all methods in parallel threads (memory usage is then not reported)
     """
     try:
-        results = []
-        
-        # TF-IDF
-        start_mem = get_memory_usage_mb()
-        start_time = time.time()
-        tfidf_topics = extract_topics_tfidf(request.transcript, request.top_n)
-        tfidf_time = time.time() - start_time
-        tfidf_mem = get_memory_usage_mb() - start_mem
-        
-        results.append(MethodResult(
-            method="TF-IDF",
-            topics=tfidf_topics,
-            time_sec=round(tfidf_time, 3),
-            memory_mb=round(tfidf_mem, 1)
-        ))
-        
-        # spaCy
-        start_mem = get_memory_usage_mb()
         start_time = time.time()
-        spacy_topics = extract_topics_spacy(request.transcript, request.top_n)
-        spacy_time = time.time() - start_time
-        spacy_mem = get_memory_usage_mb() - start_mem
-        
-        results.append(MethodResult(
-            method="spaCy",
-            topics=spacy_topics,
-            time_sec=round(spacy_time, 3),
-            memory_mb=round(spacy_mem, 1)
-        ))
-        
-        # KeyBERT
-        start_mem = get_memory_usage_mb()
-        start_time = time.time()
-        keybert_topics = extract_topics_keybert(request.transcript, request.top_n)
-        keybert_time = time.time() - start_time
-        keybert_mem = get_memory_usage_mb() - start_mem
-        
-        results.append(MethodResult(
-            method="KeyBERT",
-            topics=keybert_topics,
-            time_sec=round(keybert_time, 3),
-            memory_mb=round(keybert_mem, 1)
-        ))
-        
-        # DistilBERT + Clustering
-        start_mem = get_memory_usage_mb()
-        start_time = time.time()
-        distilbert_topics = extract_topics_distilbert(request.transcript, request.top_n)
-        distilbert_time = time.time() - start_time
-        distilbert_mem = get_memory_usage_mb() - start_mem
-        
-        results.append(MethodResult(
-            method="DistilBERT+Clustering",
-            topics=distilbert_topics,
-            time_sec=round(distilbert_time, 3),
-            memory_mb=round(distilbert_mem, 1)
-        ))
-        
-        # SentenceTransformer + Clustering
-        start_mem = get_memory_usage_mb()
-        start_time = time.time()
-        st_topics = extract_topics_st_clustering(request.transcript, request.top_n)
-        st_time = time.time() - start_time
-        st_mem = get_memory_usage_mb() - start_mem
-        
-        results.append(MethodResult(
-            method="ST+Clustering",
-            topics=st_topics,
-            time_sec=round(st_time, 3),
-            memory_mb=round(st_mem, 1)
-        ))
+        if concurrent:
+            results = list(await asyncio.gather(*[
+                asyncio.to_thread(_run_method, name, fn, request.transcript, request.top_n, False)
+                for name, fn in METHODS
+            ]))
+        else:
+            # One method at a time (so memory deltas stay attributable), still off the event loop
+            results = [
+                await asyncio.to_thread(_run_method, name, fn, request.transcript, request.top_n)
+                for name, fn in METHODS
+            ]
+        wall_time = time.time() - start_time
         
         # Generate summary
         total_time = sum(r.time_sec for r in results)
-        total_memory = sum(r.memory_mb for r in results)
+        if concurrent:
+            total_memory = None
+            most_memory_efficient = None
+        else:
+            total_memory = round(sum(r.memory_mb for r in results), 1)
+            most_memory_efficient = min(results, key=lambda x: x.memory_mb).method
         
         summary = {
             "total_methods": len(results),
+            "concurrent": concurrent,
             "total_time_sec": round(total_time, 3),
-            "total_memory_mb": round(total_memory, 1),
+            "wall_time_sec": round(wall_time, 3),
+            "total_memory_mb": total_memory,
             "fastest_method": min(results, key=lambda x: x.time_sec).method,
-            "most_memory_efficient": min(results, key=lambda x: x.memory_mb).method,
+            "most_memory_efficient": most_memory_efficient,
             "transcript_length": len(request.transcript),
             "top_n": request.top_n
         }
@@ -202,7 +202,7 @@ async def compare_topic_extraction_methods(request: TopicComparisonRequest):
         raise HTTPException(status_code=500, detail=f"Error comparing topic methods: {str(e)}")
 
 @router.get("/methods")
-async def get_available_methods():
+async def get_available_methods() -> Dict[str, List[Dict[str, Any]]]:
     """
     Get list of available topic extraction methods
     """
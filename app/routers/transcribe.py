@@ -1,7 +1,8 @@
 # POST /transcribe
+import asyncio
 from fastapi import APIRouter, UploadFile, File
 from pydantic import BaseModel
-from app.services.transcription import transcribe_audio
+from app.services.transcription import check_upload_size, transcribe_audio
 from app.services.topic_extraction import extract_topics, generate_summary
 
 router = APIRouter()
@@ -14,10 +15,12 @@ class TranscribeAndSummarizeResponse(BaseModel):
     topics: list[str]
     summary: str
 
-@router.post("/", response_model=TranscribeResponse)
+@router.post("", response_model=TranscribeResponse)
 async def transcribe(audio_file: UploadFile = File(...)):
     """
     Transcribe audio file to text using Whisper
     """
-    transcript = transcribe_audio(audio_file)
+    # The upload is decoded straight from its spooled file, without a copy on disk
+    check_upload_size(audio_file)
+    transcript = await asyncio.to_thread(transcribe_audio, audio_file.file)
     return {"transcript": transcript}
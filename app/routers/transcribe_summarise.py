@@ -1,6 +1,7 @@
+import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pydantic import BaseModel
-from app.services.transcription import transcribe_audio
+from app.services.transcription import check_upload_size, transcribe_audio
 from app.services.topic_extraction import extract_topics, generate_summary
 
 router = APIRouter()
@@ -10,20 +11,21 @@ class TranscribeSummariseResponse(BaseModel):
     topics: list[str]
     summary: str
 
-@router.post("/", response_model=TranscribeSummariseResponse)
+@router.post("", response_model=TranscribeSummariseResponse)
 async def transcribe_and_summarise(audio_file: UploadFile = File(...)):
     """
     Transcribe audio file to text and generate summary with topics
     """
     try:
         # Transcribe audio
-        transcript = transcribe_audio(audio_file)
+        check_upload_size(audio_file)
+        transcript = await asyncio.to_thread(transcribe_audio, audio_file.file)
         
         # Extract topics
-        topics = extract_topics(transcript)
+        topics = await asyncio.to_thread(extract_topics, transcript)
         
         # Generate summary
-        summary = generate_summary(transcript, topics)
+        summary = await asyncio.to_thread(generate_summary, transcript, topics)
         
         return {
             "transcript": transcript,
@@ -31,5 +33,7 @@ async def transcribe_and_summarise(audio_file: UploadFile = File(...)):
             "summary": summary
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
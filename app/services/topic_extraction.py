@@ -1,13 +1,70 @@
 # KeyBERT / embeddings
+import re
+import functools
+import numpy as np
+from collections import Counter
 from keybert import KeyBERT
+from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# sklearn's default token pattern, so keyword counts tokenise like its vectorizers
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+_SENT_SPLIT = re.compile(r'[.!?]+')
+_FILLERS = re.compile(r'\b(?:yeah|uh|um|like|you know|so|well)\b', re.IGNORECASE)
+_WS = re.compile(r'\s+')
+# Future-oriented phrases and dangling conjunctions used when scoring summary sentences
+_FUTURE_RE = re.compile(r'plan|next|future|will|going to')
+_INCOMPLETE_ENDS = ('and', 'but', 'so', 'because', 'the')
+
+@functools.lru_cache(maxsize=4)
+def get_sentence_transformer(model_name: str = "all-MiniLM-L6-v2") -> SentenceTransformer:
+    """
+    Load a SentenceTransformer once per model name and reuse it across requests
+    """
+    return SentenceTransformer(model_name)
+
+@functools.lru_cache(maxsize=4)
+def get_keybert_model(model: str = "all-MiniLM-L6-v2") -> KeyBERT:
+    """
+    Load a KeyBERT model once per model name and reuse it across requests
+    KeyBERT wraps the shared SentenceTransformer, so the embedding clustering
+    methods use the same weights instead of loading a second copy
+    """
+    return KeyBERT(get_sentence_transformer(model))
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase and tokenise text, dropping English stop words
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS]
+
+def is_trivial_transcript(transcript: str) -> bool:
+    """
+    Whether a transcript is too short for model-based topic extraction or summarisation to add anything
+    """
+    return len(transcript) < 40 or len(transcript.split()) < 8
+
+def cheap_topics(transcript: str, top_n=5) -> list[str]:
+    """
+    Extract topics by keyword frequency; used as a fast path for trivial transcripts
+    """
+    return [word for word, _ in Counter(tokenize(transcript)).most_common(top_n)]
 
 def extract_topics(transcript: str, top_n=5, model="all-MiniLM-L6-v2") -> list[str]:
     """
     Extract topics from text using KeyBERT
+    Results are cached, so repeated transcripts skip inference
     """
-    kw_model = KeyBERT(model)
+    return list(_extract_topics_cached(transcript, top_n, model))
+
+@functools.lru_cache(maxsize=256)
+def _extract_topics_cached(transcript: str, top_n: int, model: str) -> tuple[str, ...]:
+    if is_trivial_transcript(transcript):
+        return tuple(cheap_topics(transcript, top_n))
+    
+    kw_model = get_keybert_model(model)
     topics = kw_model.extract_keywords(transcript, top_n=top_n, stop_words="english")
-    return [t[0] for t in topics]
+    return tuple(t[0] for t in topics)
 
 def generate_summary(transcript: str, topics: list[str]) -> str:
     """
@@ -32,6 +89,8 @@ def generate_summary(transcript: str, topics: list[str]) -> str:
     Returns:
         str: Single-sentence summary that captures the key points of the conversation
         
+    Results are cached by (transcript, topics), so repeated inputs skip the scoring pass.
+        
     Example:
         >>> topics = ["mars", "starships", "landing"]
         >>> transcript = "So let's talk about Mars missions. Yeah, we have reusable ships..."
@@ -39,94 +98,89 @@ def generate_summary(transcript: str, topics: list[str]) -> str:
         >>> print(summary)
         "The discussion covers Mars mission planning with reusable ships and landing strategies."
     """
-    import re
-    
-    # Better sentence splitting for conversational content
-    sentences = re.split(r'[.!?]+', transcript)
-    sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-    
-    if len(sentences) <= 2:
+    return _generate_summary_cached(transcript, tuple(topics))
+
+@functools.lru_cache(maxsize=256)
+def _generate_summary_cached(transcript: str, topics: tuple[str, ...]) -> str:
+    # A handful of words cannot be summarised further
+    if is_trivial_transcript(transcript):
         return transcript
     
-    # Clean up conversational fillers and improve sentence quality
-    cleaned_sentences = []
-    for sentence in sentences:
-        # Remove excessive repetition and fillers
-        sentence = re.sub(r'\b(yeah|uh|um|like|you know|so|well)\b', '', sentence, flags=re.IGNORECASE)
-        sentence = re.sub(r'\s+', ' ', sentence).strip()
-        if len(sentence) > 15:  # Only keep substantial sentences
-            cleaned_sentences.append(sentence)
+    # Remove conversational fillers once over the whole transcript; fillers never
+    # contain sentence punctuation, so splitting afterwards yields the same sentences
+    cleaned = _WS.sub(' ', _FILLERS.sub('', transcript))
+    
+    # Split into sentences and only keep substantial ones
+    cleaned_sentences = [sentence for sentence in (part.strip() for part in _SENT_SPLIT.split(cleaned)) if len(sentence) > 15]
     
     if len(cleaned_sentences) <= 2:
         return transcript
     
-    # Advanced scoring system for conversational content
-    scored_sentences = []
-    for i, sentence in enumerate(cleaned_sentences):
-        score = 0
-        
-        # 1. Topic relevance (most important)
-        topic_matches = sum(1 for topic in topics if topic.lower() in sentence.lower())
-        topic_score = (topic_matches / len(topics)) * 0.4 if topics else 0
-        
-        # 2. Content density (prefer sentences with more meaningful content)
-        word_count = len(sentence.split())
-        content_density = min(word_count / 50, 1.0) * 0.2
-        
-        # 3. Position weighting (conversational structure)
-        total_sentences = len(cleaned_sentences)
-        if i < total_sentences * 0.1:  # First 10% - introduction
-            position_score = 0.15
-        elif i > total_sentences * 0.8:  # Last 20% - conclusion
-            position_score = 0.15
-        elif total_sentences * 0.3 <= i <= total_sentences * 0.7:  # Middle 40% - main content
-            position_score = 0.25
-        else:
-            position_score = 0.1
-        
-        # 4. Question/statement bonus (conversational elements)
-        question_bonus = 0
-        future_bonus = 0
-        
-        if '?' in sentence:
-            question_bonus = 0.1
-        elif any(word in sentence.lower() for word in ['plan', 'next', 'future', 'will', 'going to']):
-            future_bonus = 0.1
-        
-        # 5. Length penalty (avoid too short or too long)
-        if len(sentence) < 30:
-            length_penalty = 0.1
-        elif len(sentence) > 300:
-            length_penalty = 0.05
-        else:
-            length_penalty = 0
-        
-        # 6. Conversational quality (avoid incomplete thoughts)
-        if sentence.endswith(('and', 'but', 'so', 'because', 'the')):
-            incomplete_penalty = 0.1
-        else:
-            incomplete_penalty = 0
-        
-        # Combined score
-        score = topic_score + content_density + position_score + question_bonus + future_bonus - length_penalty - incomplete_penalty
-        scored_sentences.append((score, sentence, i))
+    # Advanced scoring system for conversational content, computed for all
+    # sentences at once; the string checks still run per sentence, the
+    # arithmetic is vectorised
+    lower_topics = [topic.lower() for topic in topics]
+    n_topics = len(topics)
+    total_sentences = len(cleaned_sentences)
+    lower_sentences = [sentence.lower() for sentence in cleaned_sentences]
+    positions = np.arange(total_sentences)
     
-    # Sort by score and select diverse sentences
-    scored_sentences.sort(key=lambda x: x[0], reverse=True)
-    
-    # Select the single best sentence that captures the essence
-    if scored_sentences:
-        best_sentence = scored_sentences[0][1]  # Get the highest scoring sentence
-        
-        # Clean up the sentence for better readability
-        best_sentence = re.sub(r'\s+', ' ', best_sentence).strip()
-        
-        # Ensure it ends with proper punctuation
-        if not best_sentence.endswith(('.', '!', '?')):
-            best_sentence += '.'
-        
-        summary = best_sentence
+    # 1. Topic relevance (most important)
+    if n_topics:
+        topic_matches = np.fromiter(
+            (sum(topic in lower_sentence for topic in lower_topics) for lower_sentence in lower_sentences),
+            dtype=np.int64, count=total_sentences
+        )
+        topic_score = (topic_matches / n_topics) * 0.4
     else:
-        summary = transcript
+        topic_score = np.zeros(total_sentences)
+    
+    # 2. Content density (prefer sentences with more meaningful content)
+    # Sentences are stripped with whitespace collapsed to single spaces, so
+    # counting spaces gives the word count without allocating a word list
+    word_counts = np.fromiter((sentence.count(' ') + 1 for sentence in cleaned_sentences), dtype=np.int64, count=total_sentences)
+    content_density = np.minimum(word_counts / 50, 1.0) * 0.2
+    
+    # 3. Position weighting (conversational structure): first 10% introduction,
+    # last 20% conclusion, middle 40% main content
+    position_score = np.select(
+        [
+            positions < total_sentences * 0.1,
+            positions > total_sentences * 0.8,
+            (positions >= total_sentences * 0.3) & (positions <= total_sentences * 0.7),
+        ],
+        [0.15, 0.15, 0.25],
+        default=0.1
+    )
+    
+    # 4. Question/statement bonus (conversational elements); questions and
+    # future-oriented statements earn the same bonus and never both
+    conversational_bonus = np.fromiter(
+        ('?' in sentence or _FUTURE_RE.search(lower_sentence) is not None
+         for sentence, lower_sentence in zip(cleaned_sentences, lower_sentences)),
+        dtype=bool, count=total_sentences
+    ) * 0.1
+    
+    # 5. Length penalty (avoid too short or too long)
+    lengths = np.fromiter(map(len, cleaned_sentences), dtype=np.int64, count=total_sentences)
+    length_penalty = np.where(lengths < 30, 0.1, np.where(lengths > 300, 0.05, 0.0))
+    
+    # 6. Conversational quality (avoid incomplete thoughts)
+    incomplete_penalty = np.fromiter(
+        (sentence.endswith(_INCOMPLETE_ENDS) for sentence in cleaned_sentences),
+        dtype=bool, count=total_sentences
+    ) * 0.1
+    
+    # Combined score; only the best sentence is needed, and argmax keeps the
+    # earliest sentence on ties
+    scores = topic_score + content_density + position_score + conversational_bonus - length_penalty - incomplete_penalty
+    best_sentence = cleaned_sentences[int(np.argmax(scores))]
+    
+    # Clean up the selected sentence for better readability
+    summary = _WS.sub(' ', best_sentence).strip()
+    
+    # Ensure it ends with proper punctuation
+    if not summary.endswith(('.', '!', '?')):
+        summary += '.'
     
     return summary
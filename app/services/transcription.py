@@ -1,22 +1,82 @@
-import whisper
-import tempfile
-import shutil
+import os
+import functools
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 from pathlib import Path
-from fastapi import UploadFile
+from typing import BinaryIO, Optional, Union
+from fastapi import UploadFile, HTTPException
 
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # 100 MB
+# Speech chunks (up to 30 s each) encoded and decoded together per batch
+TRANSCRIBE_BATCH_SIZE = 16
 
-def transcribe_audio(audio_file: UploadFile, model_size="base", device="cpu") -> str:
+
+def check_upload_size(audio_file: UploadFile, max_bytes: Optional[int] = None) -> None:
+    """
+    Reject uploads larger than max_bytes (default MAX_UPLOAD_BYTES) and rewind the upload for reading
+    """
+    if max_bytes is None:
+        max_bytes = MAX_UPLOAD_BYTES
+
+    size = audio_file.size
+    if size is None:
+        size = audio_file.file.seek(0, os.SEEK_END)
+    audio_file.file.seek(0)
+
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Audio file too large (max {max_bytes // (1024 * 1024)} MB)")
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_device() -> str:
+    """
+    Transcribe on the GPU when CTranslate2 (faster-whisper's backend) can see one
+    Probed on first use rather than at import: the probe initialises CUDA, which must
+    not happen in a process that later forks (gunicorn --preload)
+    """
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def get_whisper_model(model_size="base", device: Optional[str] = None) -> WhisperModel:
+    """
+    Load a faster-whisper (CTranslate2) model once per (size, device) and reuse it across requests
+    INT8 weights on CPU, FP16 on GPU; device defaults to get_default_device()
+    """
+    return _load_whisper_model(model_size, device or get_default_device())
+
+
+@functools.lru_cache(maxsize=2)
+def _load_whisper_model(model_size: str, device: str) -> WhisperModel:
+    compute_type = "int8" if device == "cpu" else "float16"
+    return WhisperModel(model_size, device=device, compute_type=compute_type)
+
+
+def get_batched_pipeline(model_size="base", device: Optional[str] = None) -> BatchedInferencePipeline:
+    """
+    Wrap the cached Whisper model in faster-whisper's batched inference pipeline
+    """
+    return _load_batched_pipeline(model_size, device or get_default_device())
+
+
+@functools.lru_cache(maxsize=2)
+def _load_batched_pipeline(model_size: str, device: str) -> BatchedInferencePipeline:
+    return BatchedInferencePipeline(model=get_whisper_model(model_size, device))
+
+
+def transcribe_audio(audio: Union[str, Path, BinaryIO], model_size="base", device: Optional[str] = None) -> str:
     """
     Transcribe audio file using Whisper
+    Accepts a path or a binary file object (such as an upload), which is decoded in memory
+    Silero VAD splits the audio into speech chunks of up to 30 s, which are transcribed
+    independently in batches instead of sliding sequentially over 30 s windows
     """
-    model = whisper.load_model(model_size, device=device)
+    pipeline = get_batched_pipeline(model_size, device)
 
-    # save uploaded file temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-        shutil.copyfileobj(audio_file.file, tmp)
-        tmp_path = Path(tmp.name)
+    if isinstance(audio, Path):
+        audio = str(audio)
 
-    result = model.transcribe(str(tmp_path))
-    transcript = result["text"]
+    # segments is a lazy generator; decoding happens while joining
+    segments, _ = pipeline.transcribe(audio, beam_size=5, batch_size=TRANSCRIBE_BATCH_SIZE)
+    transcript = "".join(segment.text for segment in segments)
 
     return transcript
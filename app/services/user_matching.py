@@ -1,7 +1,8 @@
 # Cosine similarity + interpretation
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
+import math
+import functools
 import numpy as np
+from app.services.vectorization import vectorize_topics
 
 def compute_compatibility(user1_data: dict, user2_data: dict, topics: list[str] = None, 
                          topic_weight: float = 0.5, psych_weight: float = 1.0) -> tuple[float, str]:
@@ -24,14 +25,10 @@ def compute_compatibility(user1_data: dict, user2_data: dict, topics: list[str]
     if not user1_psych_raw or not user2_psych_raw:
         return 0.0, "No psychometric data available"
     
-    # Normalize and resample psychometric data
-    user1_psych = normalize_psychometrics(user1_psych_raw)
-    user2_psych = normalize_psychometrics(user2_psych_raw)
-    
-    # Resample to ensure same dimensions
-    target_length = max(len(user1_psych), len(user2_psych), 5)  # At least 5 dimensions
-    user1_psych = resample_psychometrics(user1_psych, target_length)
-    user2_psych = resample_psychometrics(user2_psych, target_length)
+    # Normalize and resample psychometric data to the same dimensions
+    target_length = max(len(user1_psych_raw), len(user2_psych_raw), 5)  # At least 5 dimensions
+    user1_psych = _prepare_psychometrics(tuple(user1_psych_raw), target_length)
+    user2_psych = _prepare_psychometrics(tuple(user2_psych_raw), target_length)
     
     # Edge case: Check for all-zero vectors (would cause division by zero in cosine similarity)
     if np.all(user1_psych == 0) or np.all(user2_psych == 0):
@@ -48,7 +45,7 @@ def compute_compatibility(user1_data: dict, user2_data: dict, topics: list[str]
         
         if not topics:
             # Fallback to psychometric-only if no valid topics
-            score = cosine_similarity([user1_psych], [user2_psych])[0][0]
+            score = _cosine(user1_psych, user2_psych)
         else:
             # Vectorize topics using TF-IDF
             topic_vector = vectorize_topics(topics)
@@ -56,17 +53,21 @@ def compute_compatibility(user1_data: dict, user2_data: dict, topics: list[str]
             # Edge case: Check if topic vector is all zeros
             if np.all(topic_vector == 0):
                 # Fallback to psychometric-only if topics don't vectorize properly
-                score = cosine_similarity([user1_psych], [user2_psych])[0][0]
+                score = _cosine(user1_psych, user2_psych)
             else:
-                # Combine topic and psychometric vectors with weights
-                user1_combined = combine_vectors(topic_vector, user1_psych, topic_weight, psych_weight)
-                user2_combined = combine_vectors(topic_vector, user2_psych, topic_weight, psych_weight)
-                
-                # Compute cosine similarity on combined vectors
-                score = cosine_similarity([user1_combined], [user2_combined])[0][0]
+                # Cosine similarity of the weighted [topic, psychometric] vectors
+                # (see combine_vectors); the topic block is shared by both users,
+                # so it adds the same term to the dot product and both squared
+                # norms and is computed once instead of concatenating vectors
+                topic_sq = topic_weight ** 2 * np.dot(topic_vector, topic_vector)
+                psych_sq = psych_weight ** 2
+                dot = topic_sq + psych_sq * np.dot(user1_psych, user2_psych)
+                norm = np.sqrt((topic_sq + psych_sq * np.dot(user1_psych, user1_psych)) *
+                               (topic_sq + psych_sq * np.dot(user2_psych, user2_psych)))
+                score = dot / norm if norm else 0.0
     else:
         # Fallback to psychometric-only comparison
-        score = cosine_similarity([user1_psych], [user2_psych])[0][0]
+        score = _cosine(user1_psych, user2_psych)
     
     # Edge case: Handle NaN or infinite scores
     if np.isnan(score) or np.isinf(score):
@@ -80,27 +81,30 @@ def compute_compatibility(user1_data: dict, user2_data: dict, topics: list[str]
     
     return float(score), interpretation
 
-def vectorize_topics(topics: list[str]) -> np.ndarray:
-    """
-    Vectorize topics using TF-IDF
-    """
-    text = " ".join(topics)
-    vectorizer = TfidfVectorizer()
-    vec = vectorizer.fit_transform([text])
-    return vec.toarray()[0]
-
 def combine_vectors(topic_vec: np.ndarray, psych_vec: np.ndarray, 
                    topic_weight: float = 1.0, psych_weight: float = 1.0) -> np.ndarray:
     """
     Combine topic and psychometric vectors with specified weights
     """
-    topic_vec = np.array(topic_vec)
-    psych_vec = np.array(psych_vec)
+    topic_vec = np.asarray(topic_vec, dtype=np.float64)
+    psych_vec = np.asarray(psych_vec, dtype=np.float64)
     
     # Scale vectors with weights and concatenate
     combined = np.concatenate([topic_weight * topic_vec, psych_weight * psych_vec])
     return combined
 
+@functools.lru_cache(maxsize=1024)
+def _prepare_psychometrics(psychometric_data: tuple[float, ...], target_length: int) -> np.ndarray:
+    """Normalize and resample psychometrics, cached by value so repeat matches skip both steps"""
+    prepared = resample_psychometrics(normalize_psychometrics(psychometric_data), target_length)
+    prepared.setflags(write=False)
+    return prepared
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two 1-D vectors (0 when either is all zeros)"""
+    norm = math.sqrt(float(np.dot(a, a)) * float(np.dot(b, b)))
+    return float(np.dot(a, b)) / norm if norm else 0.0
+
 def interpret_score(score: float) -> str:
     """
     Generate natural language interpretation of compatibility score with enhanced thresholds
@@ -125,7 +129,7 @@ def resample_psychometrics(psychometric_data: list[float], target_length: int =
     Resample psychometric data to target length using interpolation
     Handles cases where psychometric vectors have different lengths
     """
-    psych_array = np.array(psychometric_data)
+    psych_array = np.asarray(psychometric_data, dtype=np.float64)
     current_length = len(psych_array)
     
     if current_length == target_length:
@@ -140,30 +144,59 @@ def resample_psychometrics(psychometric_data: list[float], target_length: int =
         return np.full(target_length, psych_array[0])
     
     # Use linear interpolation to resample
-    x_old = np.linspace(0, 1, current_length)
-    x_new = np.linspace(0, 1, target_length)
+    x_old = _unit_grid(current_length)
+    x_new = _unit_grid(target_length)
     
     resampled = np.interp(x_new, x_old, psych_array)
     return resampled
 
+def resample_psychometrics_batch(psychometric_matrix: np.ndarray, target_length: int = 5) -> np.ndarray:
+    """
+    Resample every row of an (N, L) psychometric matrix to target_length
+    Vectorised counterpart of resample_psychometrics for matching one user against many
+    """
+    psych_matrix = np.asarray(psychometric_matrix, dtype=np.float64)
+    n_rows, current_length = psych_matrix.shape
+    
+    if current_length == target_length:
+        return psych_matrix
+    
+    if current_length == 0:
+        # Return neutral values if no data
+        return np.full((n_rows, target_length), 0.5)
+    
+    if current_length == 1:
+        # Replicate single value
+        return np.repeat(psych_matrix, target_length, axis=1)
+    
+    # Linear interpolation between the two old samples either side of each new one
+    x = _unit_grid(target_length) * (current_length - 1)
+    left = np.minimum(x.astype(np.intp), current_length - 2)
+    weight = x - left
+    return psych_matrix[:, left] * (1 - weight) + psych_matrix[:, left + 1] * weight
+
+@functools.lru_cache(maxsize=64)
+def _unit_grid(length: int) -> np.ndarray:
+    """Evenly spaced sample positions on [0, 1], shared read-only between calls"""
+    grid = np.linspace(0, 1, length)
+    grid.setflags(write=False)
+    return grid
+
 def normalize_psychometrics(psychometric_data: list[float]) -> np.ndarray:
     """
     Normalize psychometric data to [0, 1] range
     Handles cases where data might be outside expected range
     """
-    psych_array = np.array(psychometric_data)
-    
-    # Handle all same values
-    if np.all(psych_array == psych_array[0]):
-        return np.full_like(psych_array, 0.5)
+    psych_array = np.asarray(psychometric_data, dtype=np.float64)
     
     # Min-max normalization to [0, 1]
     min_val = np.min(psych_array)
     max_val = np.max(psych_array)
     
+    # Handle all same values
     if max_val == min_val:
-        return np.full_like(psych_array, 0.5)
+        return np.full(psych_array.shape, 0.5)
     
-    normalized = (psych_array - min_val) / (max_val - min_val)
-    return np.clip(normalized, 0.0, 1.0)
+    # Rounding is monotonic, so the result already lies in [0, 1] without clipping
+    return (psych_array - min_val) / (max_val - min_val)
 
@@ -1,21 +1,37 @@
 # TF-IDF / embeddings / one-hot
-from sklearn.feature_extraction.text import TfidfVectorizer
+import re
+import functools
+from collections import Counter
 import numpy as np
 
+# sklearn's default token pattern, so topics tokenise like TfidfVectorizer
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
 def vectorize_topics(topics: list[str]) -> np.ndarray:
     """
     Vectorize topics using TF-IDF
+    The topics form a single document, so every IDF is 1 and the vector is the
+    L2-normalised term counts over the sorted vocabulary; computed directly
+    instead of fitting a TfidfVectorizer per call
+    Results are cached and read-only; topic order does not affect the vector
     """
-    text = " ".join(topics)
-    vectorizer = TfidfVectorizer()
-    vec = vectorizer.fit_transform([text])
-    return vec.toarray()[0]
+    return _vectorize_topics_cached(tuple(sorted(topics)))
+
+@functools.lru_cache(maxsize=1024)
+def _vectorize_topics_cached(topics: tuple[str, ...]) -> np.ndarray:
+    counts = Counter(_TOKEN_RE.findall(" ".join(topics).lower()))
+    vec = np.array([counts[term] for term in sorted(counts)], dtype=np.float64)
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec = vec / norm
+    vec.setflags(write=False)
+    return vec
 
 def vectorize_psychometrics(psychometric_data: dict) -> np.ndarray:
     """
     Vectorize psychometric profile data
     """
-    return np.array(psychometric_data)
+    return np.asarray(psychometric_data, dtype=np.float64)
 
 def fuse_vectors(topic_vector: np.ndarray, psychometric_vector: np.ndarray) -> np.ndarray:
     """
@@ -1,5 +1,7 @@
 # I/O utilities
-import json
+import os
+import functools
+import orjson
 from typing import Dict, Any, List
 from pathlib import Path
 
@@ -7,15 +9,16 @@ def load_json(file_path: str) -> Dict[str, Any]:
     """
     Load JSON file
     """
-    with open(Path(file_path), "r") as f:
-        return json.load(f)
+    with open(Path(file_path), "rb") as f:
+        return orjson.loads(f.read())
 
 def save_json(data: Dict[str, Any], file_path: str) -> None:
     """
     Save data to JSON file
+    Non-string keys are stringified, as with the stdlib json module
     """
-    with open(Path(file_path), "w") as f:
-        json.dump(data, f)
+    with open(Path(file_path), "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
 
 def load_users(file_path: str) -> Dict[str, Dict[str, Any]]:
     """
@@ -24,3 +27,13 @@ def load_users(file_path: str) -> Dict[str, Dict[str, Any]]:
     users_data = load_json(file_path)
     return {user["id"]: user for user in users_data}
 
+
+@functools.lru_cache(maxsize=4)
+def _load_users_cached(file_path: str, mtime: float) -> Dict[str, Dict[str, Any]]:
+    return load_users(file_path)
+
+def load_users_cached(file_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load users, reusing the parsed result until the file's modification time changes
+    """
+    return _load_users_cached(file_path, os.path.getmtime(file_path))
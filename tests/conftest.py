@@ -0,0 +1,13 @@
+# Shared fixtures
+import pytest
+from app.routers.health_check import _RUN_LOCK
+
+@pytest.fixture
+def idle_health_check():
+    """
+    Skip when this suite is itself being run by a live /health request, which holds the lock
+    Tests that patch process-wide state (module globals) would otherwise leak it into the
+    server's concurrent requests
+    """
+    if _RUN_LOCK.locked():
+        pytest.skip("Running inside a health check")
@@ -0,0 +1,108 @@
+# Test the health check endpoint and its pytest result collector
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.routers.health_check import ResultCollector, run_tests, _RUN_LOCK
+
+client = TestClient(app)
+
+def make_report(nodeid, when="call", outcome="passed"):
+    return SimpleNamespace(
+        nodeid=nodeid,
+        when=when,
+        outcome=outcome,
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        duration=0.01,
+        longreprtext="boom" if outcome == "failed" else ""
+    )
+
+def fake_run_tests(*reports, exit_code=0):
+    """Stand-in for run_tests that feeds the given reports to the collector"""
+    def run(level, collector):
+        for report in reports:
+            if report.when == "collect":
+                collector.pytest_collectreport(report)
+            else:
+                collector.pytest_runtest_logreport(report)
+        return exit_code
+    return run
+
+def test_result_collector_errors():
+    """Should report collection errors and record one result per test"""
+    collector = ResultCollector()
+    collector.pytest_collectreport(make_report("tests/test_broken.py", when="collect", outcome="failed"))
+    collector.pytest_runtest_logreport(make_report("tests/test_a.py::test_ok", when="call"))
+    collector.pytest_runtest_logreport(make_report("tests/test_a.py::test_ok", when="teardown", outcome="failed"))
+    collector.pytest_runtest_logreport(make_report("tests/test_a.py::test_bad", when="call", outcome="failed"))
+    collector.pytest_runtest_logreport(make_report("tests/test_a.py::test_bad", when="teardown", outcome="failed"))
+
+    statuses = {r.test_name: r.status for r in collector.results}
+    assert statuses == {
+        "tests/test_broken.py": "ERROR",
+        "tests/test_a.py::test_ok": "ERROR",
+        "tests/test_a.py::test_bad": "FAILED",
+    }
+
+def test_health_check_healthy(idle_health_check):
+    """Should report healthy when every test passes"""
+    run = fake_run_tests(make_report("tests/test_a.py::test_ok"))
+    with patch("app.routers.health_check.run_tests", side_effect=run):
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["passed_tests"] == 1
+    assert data["total_tests"] == 1
+
+def test_health_check_collection_error(idle_health_check):
+    """Should report unhealthy with the failing module and still run the other tests"""
+    # What pytest emits with --continue-on-collection-errors: the collect error
+    # first, then the tests that did import, and exit code TESTS_FAILED
+    run = fake_run_tests(
+        make_report("tests/test_broken.py", when="collect", outcome="failed"),
+        make_report("tests/test_a.py::test_ok"),
+        exit_code=pytest.ExitCode.TESTS_FAILED
+    )
+    with patch("app.routers.health_check.run_tests", side_effect=run):
+        response = client.get("/health", params={"level": "full"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "unhealthy"
+    assert data["passed_tests"] == 1
+    assert data["failed_tests"] == 1
+    broken = data["test_results"][0]
+    assert broken["test_name"] == "tests/test_broken.py"
+    assert broken["status"] == "ERROR"
+
+def test_health_check_rejects_overlapping_runs(idle_health_check):
+    """Should return 503 while another health check is running"""
+    with patch("app.routers.health_check.run_tests") as mock_run:
+        assert _RUN_LOCK.acquire(blocking=False)
+        try:
+            response = client.get("/health")
+        finally:
+            _RUN_LOCK.release()
+
+    assert response.status_code == 503
+    mock_run.assert_not_called()
+
+def test_full_level_reports_import_errors(tmp_path, monkeypatch):
+    """Should fail the full level when a test module cannot be imported, still running the rest"""
+    (tmp_path / "test_hc_passing.py").write_text("def test_ok():\n    pass\n")
+    (tmp_path / "test_hc_broken.py").write_text("import module_that_does_not_exist\n")
+    monkeypatch.setattr("app.routers.health_check.TESTS_DIR", tmp_path)
+
+    collector = ResultCollector()
+    exit_code = run_tests("full", collector)
+
+    assert exit_code == pytest.ExitCode.TESTS_FAILED
+    statuses = {r.test_name.rsplit("/", 1)[-1]: r.status for r in collector.results}
+    assert statuses == {
+        "test_hc_broken.py": "ERROR",
+        "test_hc_passing.py::test_ok": "PASSED",
+    }
@@ -9,7 +9,7 @@ def test_complete_workflow_transcript_to_matching():
     """Should complete workflow: transcript -> topics -> summary -> user matching"""
     # Step 1: Summarize transcript
     transcript = "We discussed artificial intelligence and machine learning technologies for data analysis."
-    summarise_response = client.post("/summarise/", json={"transcript": transcript})
+    summarise_response = client.post("/summarise", json={"transcript": transcript})
     
     assert summarise_response.status_code == 200
     summarise_data = summarise_response.json()
@@ -22,7 +22,7 @@ def test_complete_workflow_transcript_to_matching():
     assert len(summary) > 0
     
     # Step 2: Use extracted topics for user matching
-    match_response = client.post("/match/", json={
+    match_response = client.post("/match", json={
         "user1_id": "user_1",
         "user2_id": "user_2",
         "topics": topics
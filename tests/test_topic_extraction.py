@@ -1,6 +1,6 @@
 # Test topic extraction functionality
 import pytest
-from app.services.topic_extraction import extract_topics, generate_summary
+from app.services.topic_extraction import extract_topics, generate_summary, is_trivial_transcript, cheap_topics
 
 def test_extract_topics():
     """Should extract topics from text"""
@@ -21,6 +21,13 @@ def test_extract_topics_edge_cases():
     topics = extract_topics("AI")
     assert isinstance(topics, list)
 
+def test_extract_topics_trivial_transcript():
+    """Should use keyword counts instead of KeyBERT for trivial transcripts"""
+    transcript = "Mars, Mars and the ship"
+    
+    assert is_trivial_transcript(transcript)
+    assert extract_topics(transcript, top_n=2) == cheap_topics(transcript, top_n=2) == ["mars", "ship"]
+
 def test_generate_summary():
     """Should generate a summary"""
     transcript = """
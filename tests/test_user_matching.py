@@ -1,6 +1,10 @@
 # Test user matching functionality
 import pytest
-from app.services.user_matching import compute_compatibility, interpret_score
+import numpy as np
+from app.services.user_matching import (
+    compute_compatibility, interpret_score, normalize_psychometrics,
+    resample_psychometrics, resample_psychometrics_batch
+)
 
 def test_same_user_compatibility():
     """Same user should have perfect compatibility"""
@@ -63,6 +67,34 @@ def test_empty_psychometrics():
     assert score == 0.0
     assert "No psychometric data available" in interpretation
 
+def test_constant_integer_psychometrics():
+    """Constant integer psychometrics should normalise to neutral 0.5 values"""
+    normalized = normalize_psychometrics([3, 3, 3, 3, 3])
+    assert normalized.tolist() == [0.5] * 5
+    
+    user1_data = {"id": "user_1", "psychometrics": [3, 3, 3, 3, 3]}
+    user2_data = {"id": "user_2", "psychometrics": [1, 2, 3, 4, 5]}
+    score, interpretation = compute_compatibility(user1_data, user2_data)
+    assert score > 0.0
+    assert "No psychometric data available" not in interpretation
+
+def test_resample_psychometrics_batch():
+    """Batch resampling should match resampling each row on its own"""
+    matrix = np.array([
+        [0.1, 0.9, 0.4],
+        [0.0, 0.5, 1.0],
+        [0.3, 0.3, 0.3],
+    ])
+    
+    for target_length in (1, 2, 3, 5, 8):
+        expected = np.vstack([resample_psychometrics(row, target_length) for row in matrix])
+        resampled = resample_psychometrics_batch(matrix, target_length)
+        assert resampled.shape == (3, target_length)
+        assert np.allclose(resampled, expected)
+    
+    # A single column is replicated across the new length
+    assert np.allclose(resample_psychometrics_batch(matrix[:, :1], 4), [[0.1] * 4, [0.0] * 4, [0.3] * 4])
+
 def test_interpret_score():
     """Score interpretation should work for different ranges"""
     assert "Exceptionally compatible" in interpret_score(0.95)
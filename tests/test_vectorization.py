@@ -51,4 +51,24 @@ def test_vectorization_edge_cases():
     psychometric_vector = np.array([0.3, 0.4, 0.5, 0.6])
     fused = fuse_vectors(topic_vector, psychometric_vector)
     assert isinstance(fused, np.ndarray)
-    assert len(fused) == 6
\ No newline at end of file
+    assert len(fused) == 6
+
+def test_vectorize_topics_matches_tfidf():
+    """Should match a TfidfVectorizer fitted on the joined topics"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    topics = ["Machine learning", "deep learning", "AI", "learning"]
+    expected = TfidfVectorizer().fit_transform([" ".join(topics)]).toarray()[0]
+
+    assert np.allclose(vectorize_topics(topics), expected)
+
+    # Nothing to tokenise gives an empty vector rather than an error
+    assert len(vectorize_topics(["a", "?"])) == 0
+
+def test_vectorize_topics_cached():
+    """Should return the same read-only vector regardless of topic order"""
+    first = vectorize_topics(["space travel", "mars"])
+    second = vectorize_topics(["mars", "space travel"])
+
+    assert first is second
+    assert not first.flags.writeable